@@ -1,29 +1,215 @@
 import cv2
+import mss
 import numpy as np
+import os
 import pyautogui
 import pytesseract
+import threading
 from abc import ABC
-from datetime import datetime
-from random import randint
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from PIL import Image
+from random import Random
+from time import monotonic, sleep
+
+try:
+    # kernels compiled ahead of time by setup.py
+    from ._pyvisauto_kernels import nms as _nms
+except ImportError:
+    # fall back to compiling the kernels on first use. numba is only imported
+    # here, as importing it is slow
+    from numba import njit
+    from . import _kernels
+    _nms = njit(cache=True)(_kernels.nms)
+
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    # tesserocr is optional; ocr() falls back to pytesseract without it
+    PyTessBaseAPI = None
 
 
 # disable pyautogui failsafe when mouse moves to corner of screen
 pyautogui.FAILSAFE = False
 
+try:
+    # only true when OpenCV was built with CUDA and a device is available
+    _CUDA_ENABLED = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    _CUDA_ENABLED = False
+
+# random number generator used for picking hover and click coordinates
+_RNG = Random()
+# templates with a side shorter than this (in pixels) are too small to be
+# matched against a downscaled capture, and are always matched at full size
+_PYRAMID_MIN_SIZE = 12
+# distance in full resolution pixels around each downscaled match candidate
+# that is searched again at full resolution
+_PYRAMID_PAD = 3
+
+
+class _Template(object):
+    """Private class holding the matrix representation of a target asset along
+    with the data derived from it that is used during matching.
+    """
+    def __init__(self, image):
+        self.image = image
+        self.shape = image.shape
+        # downscaled template, created on the first coarse-to-fine search
+        self.small = None
+        self._gpu = None
+
+    def gpu(self):
+        """Method for getting a copy of the template on the GPU, uploading it
+        if it does not exist yet.
+
+        Returns:
+            cv2.cuda_GpuMat: template uploaded to the GPU.
+        """
+        if self._gpu is None:
+            self._gpu = cv2.cuda_GpuMat()
+            self._gpu.upload(self.image)
+        return self._gpu
+
+
+def _parse_tesseract_config(config):
+    """Private function for translating a pytesseract config string into
+    tesserocr options. Only the --oem, --psm, and -c options are supported.
+
+    Args:
+        config (str): pytesseract config for OCR.
+
+    Returns:
+        tuple: OCR engine mode (or None), page segmentation mode (or None), and
+            list of (name, value) tesseract variables. None if the config
+            contains options that tesserocr can not express.
+    """
+    oem = None
+    psm = None
+    variables = []
+    tokens = config.split() if config else []
+    while tokens:
+        token = tokens.pop(0)
+        if token in ('--oem', '--psm', '-c') and not tokens:
+            return None
+        if token == '--oem':
+            value = tokens.pop(0)
+            if not value.isdigit():
+                return None
+            oem = int(value)
+        elif token == '--psm':
+            value = tokens.pop(0)
+            if not value.isdigit():
+                return None
+            psm = int(value)
+        elif token == '-c':
+            name, sep, value = tokens.pop(0).partition('=')
+            if not sep:
+                return None
+            variables.append((name, value))
+        else:
+            return None
+    return oem, psm, variables
+
+
+def _decode(buf):
+    """Private function for decoding the contents of an image file into a
+    grayscale matrix.
+
+    Args:
+        buf (bytes): contents of the image file.
+
+    Returns:
+        numpy.ndarray: grayscale matrix representation of the image. None if
+            the contents could not be decoded.
+    """
+    return cv2.imdecode(np.frombuffer(buf, np.uint8), cv2.IMREAD_GRAYSCALE)
+
+
+@lru_cache(maxsize=256)
+def _load_template(path, mtime):
+    """Private function for loading a target asset image file as a grayscale
+    matrix. Results are cached so that repeated searches (such as those in the
+    wait() and wait_vanish() methods) do not decode the file every time.
+
+    Args:
+        path (str): path to target asset image file.
+        mtime (float): modification time of the target asset image file. Only
+            used as part of the cache key so that modified files are reloaded.
+
+    Returns:
+        _Template: representation of the target asset and its downscaled
+            version. Should not be modified in place, as it is shared between
+            callers.
+
+    Raises:
+        ValueError: raised if the file could not be decoded as an image.
+    """
+    with open(path, 'rb') as f:
+        buf = f.read()
+    image = _decode(buf)
+    if image is None:
+        raise ValueError(f"{path} could not be decoded as an image.")
+    return _Template(image)
+
+
+def _find_peaks(scores, th, tw, similarity):
+    """Private function for finding the non-overlapping matches in a
+    cv2.matchTemplate result.
+
+    Args:
+        scores (numpy.ndarray): cv2.matchTemplate result.
+        th (int): height of the template in pixels.
+        tw (int): width of the template in pixels.
+        similarity (float): min similarity score of kept matches.
+
+    Returns:
+        tuple: x-coordinates, y-coordinates, and scores of kept matches as
+            numpy arrays, in row-major order.
+    """
+    flat = scores.ravel()
+    idxs = np.flatnonzero(flat >= similarity)
+    ys, xs = np.unravel_index(idxs, scores.shape)
+    # the ahead of time compiled kernel only accepts the exact types from its
+    # signature, and np.unravel_index returns int32 on 32-bit platforms
+    ys = ys.astype(np.int64, copy=False)
+    xs = xs.astype(np.int64, copy=False)
+    vals = flat[idxs].astype(np.float32, copy=False)
+    keep = _nms(ys, xs, vals, scores.shape[0], scores.shape[1], th, tw)
+    return xs[keep], ys[keep], vals[keep]
+
 
 class ImageMatch(ABC):
     """Abstract base class for both Region and Match classes. Ensures that
     convenience variables and methods are shared between the two classes.
     """
+    __slots__ = (
+        'x', 'y', 'w', 'h', '_captured_bgra', '_captured_gray',
+        '_captured_dirty', '_captured_small', '_captured_gpu',
+        '__weakref__')
 
     # path to tesseract if it does not exist in the path
     TESSERACT_PATH = ''
-    # mouse movement speed
+    # mouse movement speed. Copied onto each Region and Match when created,
+    # so it can also be changed for individual instances
     MOUSE_MOVE_SPEED = 0.2
-    # time in seconds to wait between searching for an asset in the wait() and
-    # wait_vanish methods().
+    # max time in seconds to wait between searching for an asset in the
+    # wait(), wait_any(), and wait_vanish() methods. The wait starts at
+    # MIN_SCAN_RATE and doubles after every failed search until it reaches
+    # SCAN_RATE.
     SCAN_RATE = 0.05
+    MIN_SCAN_RATE = 0.005
+    # set to a tolerance (such as 0.15) to enable coarse-to-fine matching:
+    # matches are first searched for in a half-size copy of the region, and
+    # only candidates scoring above the requested similarity minus this
+    # tolerance are searched again at full size. This is faster, but can miss
+    # matches that lose their detail when downscaled (such as thin text).
+    # Defaults to None, which always searches the whole region at full size.
+    PYRAMID_TOLERANCE = None
+    # regions with at least this many pixels are matched on the GPU when
+    # OpenCV was built with CUDA support and a CUDA device is available. Set
+    # to None to never match on the GPU.
+    CUDA_MIN_AREA = 1920 * 1080
     # assign the method for overriding the hover methods to this class
     # variable. Should accept the parameters (region, x, y)
     override_hover_method = None
@@ -37,45 +223,262 @@ class ImageMatch(ABC):
     # accept the parameters (region, x, y)
     click_callback = None
 
-    _captured = None
+    # per-thread storage for tesserocr API instances, keyed by (lang, config),
+    # as an instance can not be used by several threads at once. None when the
+    # combination has to be handled by pytesseract instead
+    _tesserocr = threading.local()
+    # shared CUDA template matcher, created on first use
+    _cuda_matcher = None
+    # per-thread storage for mss screen grabbers, as mss instances can not be
+    # shared between threads
+    _mss = threading.local()
+
+    @classmethod
+    def _screen_grabber(cls):
+        """Private method for getting the mss screen grabber for the current
+        thread, creating one if it does not exist yet.
+
+        Returns:
+            mss.base.MSSBase: mss screen grabber instance.
+        """
+        sct = getattr(cls._mss, 'sct', None)
+        if sct is None:
+            sct = cls._mss.sct = mss.mss()
+        return sct
+
+    @classmethod
+    def _tesserocr_api(cls, lang, config):
+        """Private method for getting the current thread's persistent
+        tesserocr API instance for the language and config, creating one if it
+        does not exist yet. Keeping the instance around avoids starting
+        tesseract and loading the language model for every OCR attempt.
+
+        Args:
+            lang (str): language to OCR for.
+            config (str): pytesseract config for OCR.
+
+        Returns:
+            tesserocr.PyTessBaseAPI: tesserocr API instance. None if tesserocr
+                is not installed, could not be initialized, or does not
+                support the config.
+        """
+        apis = getattr(cls._tesserocr, 'apis', None)
+        if apis is None:
+            apis = cls._tesserocr.apis = {}
+        key = (lang, config)
+        if key in apis:
+            return apis[key]
+
+        api = None
+        options = _parse_tesseract_config(config)
+        if PyTessBaseAPI is not None and options is not None:
+            oem, psm, variables = options
+            kwargs = {'lang': lang}
+            if oem is not None:
+                kwargs['oem'] = oem
+            if psm is not None:
+                kwargs['psm'] = psm
+            try:
+                api = PyTessBaseAPI(**kwargs)
+            except RuntimeError:
+                api = None
+            else:
+                for name, value in variables:
+                    api.SetVariable(name, value)
+        apis[key] = api
+        return api
 
     def _capture(self):
         """Private method for capturing the defined region.
 
         Returns:
-            PIL.Image: object representating captured region.
+            mss.screenshot.ScreenShot: object representating captured region,
+                backed by a raw BGRA buffer.
         """
-        return pyautogui.screenshot(region=(self.x, self.y, self.w, self.h))
+        return self._screen_grabber().grab({
+            'left': self.x, 'top': self.y, 'width': self.w, 'height': self.h})
 
-    def _match_template(self, target, template=None, cached=False):
+    def _captured_image(self):
+        """Private method for converting the captured region to a PIL image.
+        The BGRA buffer is decoded straight into RGB by PIL, dropping the
+        alpha channel.
+
+        Returns:
+            PIL.Image: RGB image of the captured region.
+        """
+        h, w = self._captured_bgra.shape[:2]
+        return Image.frombuffer(
+            'RGB', (w, h), self._captured_bgra, 'raw', 'BGRX', 0, 1)
+
+    @property
+    def _captured(self):
+        """numpy.ndarray: grayscale representation of the captured region for
+        matching, or None if the region has not been captured yet. Converted
+        from the raw capture on first use after each capture.
+        """
+        # direct subclasses of ImageMatch may not have initialized the
+        # capture slots through _clear_captured()
+        if getattr(self, '_captured_dirty', False):
+            # convert straight into the previous grayscale buffer when the
+            # region size has not changed, instead of allocating a new one
+            gray = self._captured_gray
+            shape = self._captured_bgra.shape[:2]
+            if gray is not None and gray.shape != shape:
+                gray = None
+            self._captured_gray = cv2.cvtColor(
+                self._captured_bgra, cv2.COLOR_BGRA2GRAY, dst=gray)
+            self._captured_dirty = False
+        return getattr(self, '_captured_gray', None)
+
+    def _clear_captured(self):
+        """Private method for discarding the captured region and all data
+        derived from it.
+        """
+        self._captured_bgra = None
+        self._captured_gray = None
+        self._captured_dirty = False
+        self._captured_small = None
+        self._captured_gpu = None
+
+    def _update_captured(self):
+        """Private method for capturing the defined region and storing its raw
+        BGRA representation. Clears all data derived from the previous
+        capture; the grayscale representation for matching is only computed
+        once it is needed.
+        """
+        gray = getattr(self, '_captured_gray', None)
+        self._clear_captured()
+        # mss screenshots expose their raw BGRA buffer through the array
+        # interface, so this wraps the buffer without copying it
+        self._captured_bgra = np.asarray(self._capture(), dtype=np.uint8)
+        # keep the previous grayscale buffer around to convert into
+        self._captured_gray = gray
+        self._captured_dirty = True
+
+    def _match_template(
+            self, target, template=None, cached=False, similarity=None):
         """Private method for finding matches from either the target asset
-        image file or a previously loaded numpy array representation of the
-        target asset.
+        image file or a previously loaded representation of the target asset.
 
         Args:
             target (str): path to target asset image file.
-            template (numpy.ndarray, optional): matrix representation of image
-                asset to search for. Used when 'target' was loaded previously.
+            template (_Template, optional): representation of image asset to
+                search for. Used when 'target' was loaded previously.
                 Defaults to None.
             cached (bool, optional): Whether or not to search against a cached
                 version of the search region. This assumes that the search
                 region was captured previously and the content has not changed
                 since then.Defaults to False.
+            similarity (float, optional): min similarity score the caller is
+                interested in. When specified, the region is searched
+                coarse-to-fine and scores outside of the candidate areas are
+                set to -1. Defaults to None.
 
         Returns:
             numpy.ndarray: cv2.matchTemplate result of match attempt.
         """
         if template is None:
-            template = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
-        template.shape[::-1]
+            template = _load_template(target, os.path.getmtime(target))
 
         if not cached or self._captured is None:
-            capture = self._capture()
-            capture_rgb = np.array(capture)
-            self._captured = cv2.cvtColor(capture_rgb, cv2.COLOR_BGR2GRAY)
+            self._update_captured()
+
+        if (
+                _CUDA_ENABLED and self.CUDA_MIN_AREA is not None
+                and self.w * self.h >= self.CUDA_MIN_AREA):
+            return self._match_captured_cuda(template)
+        if (
+                similarity is None or self.PYRAMID_TOLERANCE is None
+                or min(template.shape) < _PYRAMID_MIN_SIZE):
+            return cv2.matchTemplate(
+                self._captured, template.image, cv2.TM_CCOEFF_NORMED)
+        return self._match_template_pyramid(template, similarity)
+
+    def _match_captured_cuda(self, template):
+        """Private method for matching a target asset against the whole
+        captured region at full size on the GPU. The captured region is
+        uploaded once per capture and reused by every search against it, and
+        only the match result is downloaded.
+
+        Args:
+            template (_Template): representation of image asset to search for.
+
+        Returns:
+            numpy.ndarray: TM_CCOEFF_NORMED result of match attempt.
+        """
+        if ImageMatch._cuda_matcher is None:
+            ImageMatch._cuda_matcher = cv2.cuda.createTemplateMatching(
+                cv2.CV_8UC1, cv2.TM_CCOEFF_NORMED)
+        if self._captured_gpu is None:
+            self._captured_gpu = cv2.cuda_GpuMat()
+            self._captured_gpu.upload(self._captured)
+        return ImageMatch._cuda_matcher.match(
+            self._captured_gpu, template.gpu()).download()
+
+    def _match_template_pyramid(self, template, similarity):
+        """Private method for coarse-to-fine matching of a target asset. The
+        downscaled target asset is searched for in a downscaled copy of the
+        captured region, and only the areas around the candidates found there
+        are searched again at full size.
 
-        return cv2.matchTemplate(
-            self._captured, template, cv2.TM_CCOEFF_NORMED)
+        Args:
+            template (_Template): representation of image asset to search for.
+            similarity (float): min similarity score the caller is interested
+                in.
+
+        Returns:
+            numpy.ndarray: cv2.matchTemplate result of match attempt, with
+                scores outside of the candidate areas set to -1.
+        """
+        if self._captured_small is None:
+            self._captured_small = cv2.pyrDown(self._captured)
+        if template.small is None:
+            template.small = cv2.pyrDown(template.image)
+
+        sth, stw = template.small.shape
+        if (
+                self._captured_small.shape[0] < sth
+                or self._captured_small.shape[1] < stw):
+            return cv2.matchTemplate(
+                self._captured, template.image, cv2.TM_CCOEFF_NORMED)
+
+        th, tw = template.shape
+        rows = self._captured.shape[0] - th + 1
+        cols = self._captured.shape[1] - tw + 1
+        coarse = cv2.matchTemplate(
+            self._captured_small, template.small, cv2.TM_CCOEFF_NORMED)
+        xs, ys, _ = _find_peaks(
+            coarse, sth, stw, similarity - self.PYRAMID_TOLERANCE)
+
+        result = np.full((rows, cols), -1, dtype=np.float32)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            x0 = max(x * 2 - _PYRAMID_PAD, 0)
+            y0 = max(y * 2 - _PYRAMID_PAD, 0)
+            x1 = min(x * 2 + _PYRAMID_PAD + 1, cols)
+            y1 = min(y * 2 + _PYRAMID_PAD + 1, rows)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            result[y0:y1, x0:x1] = cv2.matchTemplate(
+                self._captured[y0:y1 + th - 1, x0:x1 + tw - 1],
+                template.image, cv2.TM_CCOEFF_NORMED)
+        return result
+
+    @staticmethod
+    def preload(paths, workers=None):
+        """Method for loading target asset image files ahead of time, so that
+        the first search for each of them does not have to read and decode
+        the file. Files are decoded in parallel. Up to 256 assets are kept
+        loaded at a time.
+
+        Args:
+            paths ([str]): paths to target asset image files.
+            workers (int, optional): max number of threads to decode files
+                with. Defaults to None, for the ThreadPoolExecutor default.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda path: _load_template(path, os.path.getmtime(path)),
+                paths))
 
     def shift_region(self, new_x, new_y):
         """Method for shifting the x and y coordinates of an existing region.
@@ -108,17 +511,19 @@ class ImageMatch(ABC):
         Returns:
             Match: Match instance representation of the match
         """
-        template = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
-        match = self._match_template(target, template, cached=cached)
+        template = _load_template(target, os.path.getmtime(target))
+        match = self._match_template(
+            target, template, cached=cached, similarity=similarity)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(match)
         if max_val < similarity:
             raise FindFailed(f"{target} not found in {self}!")
+        h, w = template.shape
         return Match(
-            target, self.x + max_loc[0], self.y + max_loc[1], len(template[0]),
-            len(template), max_val)
+            target, self.x + max_loc[0], self.y + max_loc[1], w, h, max_val)
 
     def find_all(self, target, similarity, cached=False):
         """Method that finds all matches of the target asset within the region.
+        Overlapping matches are reduced to the highest scoring one.
 
         Args:
             target (str): path to target asset image file.
@@ -132,15 +537,54 @@ class ImageMatch(ABC):
             [Match]: list of Match instances, each representing a match in
                 the region.
         """
-        template = cv2.imread(target, cv2.IMREAD_GRAYSCALE)
-        matches = self._match_template(target, template, cached=cached)
-        matches_filtered = np.where(matches >= similarity)
-        match_list = []
-        for match in zip(*matches_filtered[::-1]):
-            match_list.append(Match(
-                target, self.x + match[0], self.y + match[1], len(template[0]),
-                len(template), matches[match[1]][match[0]]))
-        return match_list
+        xs, ys, vals, (h, w) = self._find_all_raw(target, similarity, cached)
+        return [
+            Match(target, x, y, w, h, val)
+            for x, y, val in zip(xs.tolist(), ys.tolist(), vals.tolist())]
+
+    def find_all_arrays(self, target, similarity, cached=False):
+        """Method that finds all matches of the target asset within the region,
+        like find_all(), but returns them as parallel numpy arrays instead of
+        Match instances. Useful for filtering or sorting many matches with
+        vectorized operations.
+
+        Args:
+            target (str): path to target asset image file.
+            similarity (float): min similarity score of target asset in region.
+            cached (bool, optional): whether or not to search against the
+                cached copy of the region. Assumes that this region was
+                captured previously and has not changed since then. Defaults to
+                False.
+
+        Returns:
+            tuple: x-coordinates, y-coordinates, and similarity scores of the
+                matches as numpy arrays, in row-major order. Each match has
+                the width and height of the target asset.
+        """
+        xs, ys, vals, _ = self._find_all_raw(target, similarity, cached)
+        return xs, ys, vals
+
+    def _find_all_raw(self, target, similarity, cached):
+        """Private method for finding all matches of the target asset within
+        the region as numpy arrays.
+
+        Args:
+            target (str): path to target asset image file.
+            similarity (float): min similarity score of target asset in region.
+            cached (bool): whether or not to search against the cached copy of
+                the region.
+
+        Returns:
+            tuple: x-coordinates, y-coordinates, and similarity scores of the
+                matches as numpy arrays, and the (height, width) of the
+                target asset.
+        """
+        template = _load_template(target, os.path.getmtime(target))
+        matches = self._match_template(
+            target, template, cached=cached, similarity=similarity)
+        h, w = template.shape
+        xs, ys, vals = _find_peaks(matches, h, w, similarity)
+        return xs + self.x, ys + self.y, vals, template.shape
 
     def exists(self, target, similarity, cached=False):
         """Method that checks whether or not the target asset exists within the
@@ -157,12 +601,27 @@ class ImageMatch(ABC):
         Returns:
             bool: True if the target asset was found. False otherwise.
         """
-        match = self._match_template(target, cached=cached)
+        template = _load_template(target, os.path.getmtime(target))
+        match = self._match_template(
+            target, template, cached=cached, similarity=similarity)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(match)
         if max_val < similarity:
             return False
         return True
 
+    def _scan_delays(self):
+        """Private generator for the times to wait between searches in the
+        wait(), wait_any(), and wait_vanish() methods. Starts at MIN_SCAN_RATE
+        and doubles after every search, up to SCAN_RATE.
+
+        Yields:
+            float: time in seconds to wait before the next search.
+        """
+        delay = min(self.MIN_SCAN_RATE, self.SCAN_RATE)
+        while True:
+            yield delay
+            delay = min(delay * 2, self.SCAN_RATE)
+
     def wait(self, target, wait, similarity):
         """Method that waits for the target asset to appear within the region.
 
@@ -178,18 +637,51 @@ class ImageMatch(ABC):
         Returns:
             Match: Match instance.
         """
-        start = datetime.now()
-        now = datetime.now()
-        while (now - start).total_seconds() < wait:
+        deadline = monotonic() + wait
+        delays = self._scan_delays()
+        while monotonic() < deadline:
             try:
                 match = self.find(target, similarity)
                 return match
             except FindFailed:
-                sleep(self.SCAN_RATE)
-                now = datetime.now()
+                sleep(next(delays))
         raise FindFailed(
             f"{target} not found in {self} after waiting for {wait} seconds.")
 
+    def wait_any(self, targets, wait, similarity):
+        """Method that waits for any of the target assets to appear within the
+        region. Each attempt captures the region once and searches for all
+        target assets in that capture.
+
+        Args:
+            targets ([str]): paths to target asset image files, in order of
+                priority.
+            wait (int): max time in seconds to wait for an asset to appear.
+            similarity (float): min similarity score of target assets in
+                region.
+
+        Raises:
+            FindFailed: raised if none of the target assets exist in region
+                after the max wait time.
+
+        Returns:
+            Match: Match instance of the first target asset in 'targets' that
+                was found.
+        """
+        deadline = monotonic() + wait
+        delays = self._scan_delays()
+        while monotonic() < deadline:
+            self._update_captured()
+            for target in targets:
+                try:
+                    return self.find(target, similarity, cached=True)
+                except FindFailed:
+                    pass
+            sleep(next(delays))
+        raise FindFailed(
+            f"None of {targets} found in {self} after waiting for {wait} "
+            "seconds.")
+
     def wait_vanish(self, target, wait, similarity):
         """Method that returns once the target asset no longer exists in the
         region.
@@ -206,13 +698,12 @@ class ImageMatch(ABC):
         Returns:
             True: asset no longer exists in region.
         """
-        start = datetime.now()
-        now = datetime.now()
-        while (now - start).total_seconds() < wait:
+        deadline = monotonic() + wait
+        delays = self._scan_delays()
+        while monotonic() < deadline:
             if not self.exists(target, similarity):
                 return True
-            sleep(self.SCAN_RATE)
-            now = datetime.now()
+            sleep(next(delays))
         raise VanishFailed(
             f"{target} still in {self} after waiting for {wait} seconds.")
 
@@ -222,8 +713,8 @@ class ImageMatch(ABC):
         pyautogui moveTo method. If a hover_callback is specified, it will be
         called after the hover action.
         """
-        x = randint(self.x, self.x + self.w)
-        y = randint(self.y, self.y + self.h)
+        x = _RNG.randrange(self.x, self.x + self.w + 1)
+        y = _RNG.randrange(self.y, self.y + self.h + 1)
 
         if self.override_hover_method:
             self.override_hover_method(self, x, y)
@@ -245,8 +736,9 @@ class ImageMatch(ABC):
                 bottom, left). Positive values expand the valid click area,
                 while negative values constrict it. Defaults to (0, 0, 0, 0).
         """
-        x = randint(self.x - pad[3], self.x + self.w + pad[1])
-        y = randint(self.y - pad[0], self.y + self.h + pad[2])
+        top, right, bottom, left = pad
+        x = _RNG.randrange(self.x - left, self.x + self.w + right + 1)
+        y = _RNG.randrange(self.y - top, self.y + self.h + bottom + 1)
 
         if self.override_click_method:
             self.override_click_method(self, x, y, pad)
@@ -257,15 +749,20 @@ class ImageMatch(ABC):
         if self.click_callback:
             self.click_callback(self, x, y)
 
-    def ocr(self, lang, config):
+    def ocr(self, lang, config, cached=False):
         """Method for running Optical Character Recognition (OCR) on the region
-        using TesseractOCR. Tesseract must be installed separately and
-        available in your path, or the path to it must be specified in the
-        ImageMatch.TESSERACT_PATH class variable.
+        using TesseractOCR. If tesserocr is installed, a persistent tesseract
+        instance is used for each language and config combination. Otherwise,
+        tesseract must be installed separately and available in your path, or
+        the path to it must be specified in the ImageMatch.TESSERACT_PATH
+        class variable.
 
         Args:
             lang (str): language to OCR for (see pytesseract docs).
             config (str): pytesseract config for OCR (see pytesseract docs).
+            cached (bool, optional): whether or not to run OCR on the cached
+                copy of the region. Assumes that this region was captured
+                previously and has not changed since then. Defaults to False.
 
         Raises:
             Exception: raised when tesseract is not available.
@@ -273,8 +770,15 @@ class ImageMatch(ABC):
         Returns:
             str: result of OCR attempt.
         """
+        if not cached or getattr(self, '_captured_bgra', None) is None:
+            self._update_captured()
+        capture = self._captured_image()
+        api = self._tesserocr_api(lang, config)
+        if api is not None:
+            api.SetImage(capture)
+            return api.GetUTF8Text().strip()
+
         pytesseract.pytesseract.tesseract_cmd = self.TESSERACT_PATH
-        capture = self._capture()
         try:
             return pytesseract.image_to_string(
                 capture, lang=lang, config=config)
@@ -290,14 +794,16 @@ class ImageMatch(ABC):
         Args:
             filename (str): path to save screenshot to.
         """
-        capture = self._capture()
-        capture.save(filename)
+        self._update_captured()
+        self._captured_image().save(filename)
 
 
 class Region(ImageMatch):
     """Class used to define a (search) region. Create a Region to visually
     search within it or to use other ImageMatch public methods.
     """
+    __slots__ = ('MOUSE_MOVE_SPEED',)
+
     def __init__(self, x=None, y=None, w=None, h=None):
         """Initialize a Region instance. Leave all parameters blank to create
         a region for the entire screen. Fill in all parameters otherwise.
@@ -314,7 +820,8 @@ class Region(ImageMatch):
             ValueError: raised when one or more, but not all, parameters are
                 specified.
         """
-        self.MOUSE_MOVE_SPEED = Region.MOUSE_MOVE_SPEED
+        self.MOUSE_MOVE_SPEED = ImageMatch.MOUSE_MOVE_SPEED
+        self._clear_captured()
         if x is None and y is None and w is None and h is None:
             screen = pyautogui.size()
             self.x = 0
@@ -337,8 +844,11 @@ class Match(ImageMatch):
     """Class returned when an image asset search is successful. Not intended
     to be instantiated manually.
     """
+    __slots__ = ('MOUSE_MOVE_SPEED', 'name', 'similarity')
+
     def __init__(self, name, x, y, w, h, similarity):
-        self.MOUSE_MOVE_SPEED = Match.MOUSE_MOVE_SPEED
+        self.MOUSE_MOVE_SPEED = ImageMatch.MOUSE_MOVE_SPEED
+        self._clear_captured()
         self.name = name
         self.x = x
         self.y = y
@@ -0,0 +1,64 @@
+"""Numba kernels used by pyvisauto. The kernels are plain Python functions so
+that they can be both compiled ahead of time into the _pyvisauto_kernels
+extension module by setup.py, and JIT-compiled on first use when the
+extension module is not available.
+"""
+import numpy as np
+
+
+# numba signatures of the kernels, used when compiling ahead of time
+SIGNATURES = {
+    'nms': 'i8[:](i8[:], i8[:], f4[:], i8, i8, i8, i8)',
+}
+
+
+def nms(ys, xs, vals, rows, cols, th, tw):
+    """Function for greedy non-maximum suppression over candidate matches
+    from a cv2.matchTemplate result. Candidates are visited from highest to
+    lowest score, and each kept candidate suppresses all other candidates
+    whose th-by-tw match area would overlap with its own.
+
+    Args:
+        ys (numpy.ndarray): y-coordinates of candidates.
+        xs (numpy.ndarray): x-coordinates of candidates.
+        vals (numpy.ndarray): scores of candidates.
+        rows (int): height of the cv2.matchTemplate result.
+        cols (int): width of the cv2.matchTemplate result.
+        th (int): height of the template in pixels.
+        tw (int): width of the template in pixels.
+
+    Returns:
+        numpy.ndarray: sorted indices of the kept candidates.
+    """
+    if len(vals) <= 1:
+        # nothing to suppress, so skip allocating the mask
+        return np.arange(len(vals))
+
+    suppressed = np.zeros((rows, cols), np.bool_)
+    keep = np.empty(len(vals), np.int64)
+    kept = 0
+    for i in np.argsort(-vals, kind='mergesort'):
+        y = ys[i]
+        x = xs[i]
+        if suppressed[y, x]:
+            continue
+        keep[kept] = i
+        kept += 1
+        suppressed[
+            max(y - th + 1, 0):min(y + th, rows),
+            max(x - tw + 1, 0):min(x + tw, cols)] = True
+    return np.sort(keep[:kept])
+
+
+def build_cc():
+    """Function for creating the numba.pycc.CC instance that compiles all
+    kernels ahead of time into the _pyvisauto_kernels extension module.
+
+    Returns:
+        numba.pycc.CC: CC instance with all kernels exported.
+    """
+    from numba.pycc import CC
+
+    cc = CC('_pyvisauto_kernels')
+    cc.export('nms', SIGNATURES['nms'])(nms)
+    return cc
@@ -1,8 +1,65 @@
+import os
 import setuptools
+import sys
+import warnings
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+
+def kernel_extensions():
+    """Compile the numba kernels ahead of time when numba is available at
+    build time. Otherwise, or if the extension fails to build (such as when
+    no C compiler is available), pyvisauto compiles them on first use
+    instead.
+    """
+    package_dir = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'pyvisauto')
+    sys.path.insert(0, package_dir)
+    try:
+        from _kernels import build_cc
+        extension = build_cc().distutils_extension()
+    except Exception as e:
+        # numba is not installed (pyproject.toml lists it as a build
+        # requirement, so only when building without build isolation), or
+        # it could not find a usable C compiler
+        warnings.warn(
+            f"not compiling the numba kernels ahead of time ({e!r}); they "
+            "will be compiled on first use instead")
+        return []
+    finally:
+        sys.path.pop(0)
+    # place the extension module inside the package
+    extension.name = 'pyvisauto._pyvisauto_kernels'
+    # do not fail the install if the extension can not be built
+    extension.optional = True
+    return [extension]
+
+
+def optional_build_ext():
+    """Create a build_ext command that skips optional extensions when they
+    fail to build. numba raises plain exceptions (such as RuntimeError when
+    no C compiler is found), which setuptools does not treat as build errors.
+    Must be called after kernel_extensions(), as numba replaces the build_ext
+    command with its own subclass.
+    """
+    from setuptools.command import build_ext
+
+    class OptionalBuildExt(build_ext.build_ext):
+        def build_extension(self, ext):
+            try:
+                super().build_extension(ext)
+            except Exception as e:
+                if not getattr(ext, 'optional', False):
+                    raise
+                self.warn(f"skipping optional extension {ext.name}: {e}")
+
+    return OptionalBuildExt
+
+
+extensions = kernel_extensions()
+
+
 setuptools.setup(
     name="pyvisauto",
     version="1.0.3",
@@ -13,13 +70,20 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/mrmin123/pyvisauto",
     packages=['pyvisauto'],
+    ext_modules=extensions,
+    cmdclass={'build_ext': optional_build_ext()},
     install_requires=[
+        'mss~=5.0.0',
+        'numba~=0.48.0',
         'opencv-contrib-python-headless~=4.1.2.30',
         'pillow~=7.2.0',
         'pyautogui~=0.9.48',
         'pytesseract~=0.3.0',
         'numpy~=1.17.4',
     ],
+    extras_require={
+        'tesserocr': ['tesserocr~=2.5.0'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)",
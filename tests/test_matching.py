@@ -0,0 +1,224 @@
+import os
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import pyvisauto
+from pyvisauto import FindFailed, Region, _find_peaks
+
+
+class StaticRegion(Region):
+    """Region that "captures" a fixed grayscale image instead of the screen.
+    """
+
+    def __init__(self, screen):
+        super().__init__(0, 0, screen.shape[1], screen.shape[0])
+        self.screen = screen
+
+    def _capture(self):
+        return cv2.cvtColor(self.screen, cv2.COLOR_GRAY2BGRA)
+
+
+@pytest.fixture
+def screen():
+    rng = np.random.default_rng(0)
+    noise = (rng.random((120, 160)) * 255).astype(np.uint8)
+    return cv2.GaussianBlur(noise, (5, 5), 0)
+
+
+@pytest.fixture
+def region(screen):
+    return StaticRegion(screen)
+
+
+@pytest.mark.parametrize('shape', [(10, 14), (30, 40), (20, 1)])
+def test_match_template_matches_opencv(screen, region, tmp_path, shape):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:40 + shape[0], 50:50 + shape[1]])
+    expected = cv2.matchTemplate(
+        screen, cv2.imread(target, cv2.IMREAD_GRAYSCALE),
+        cv2.TM_CCOEFF_NORMED)
+    np.testing.assert_array_equal(region._match_template(target), expected)
+
+
+def test_match_template_flat_template_matches_opencv(
+        screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    template = np.full((12, 12), 128, dtype=np.uint8)
+    cv2.imwrite(target, template)
+    expected = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    np.testing.assert_array_equal(region._match_template(target), expected)
+
+
+def test_find(screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    match = region.find(target, 0.99)
+    assert (match.x, match.y, match.w, match.h) == (51, 40, 40, 30)
+
+
+def test_modified_template_is_reloaded(screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    assert region.find(target, 0.99).x == 51
+    cv2.imwrite(target, screen[10:30, 100:130])
+    mtime = os.path.getmtime(target) + 10
+    os.utime(target, (mtime, mtime))
+    match = region.find(target, 0.99)
+    assert (match.x, match.y, match.w, match.h) == (100, 10, 30, 20)
+
+
+def test_find_peaks():
+    scores = np.zeros((10, 10), dtype=np.float32)
+    scores[2, 3] = 0.9
+    scores[2, 4] = 0.95
+    scores[7, 7] = 0.8
+    scores[7, 3] = 0.5
+    xs, ys, vals = _find_peaks(scores, 3, 3, 0.6)
+    assert xs.tolist() == [4, 7]
+    assert ys.tolist() == [2, 7]
+    np.testing.assert_array_equal(vals, np.float32([0.95, 0.8]))
+    xs, ys, vals = _find_peaks(scores, 3, 3, 0.99)
+    assert len(xs) == len(ys) == len(vals) == 0
+
+
+def test_find_all_suppresses_overlapping_matches(screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    matches = region.find_all(target, 0.5)
+    assert (51, 40) in [(match.x, match.y) for match in matches]
+    for i, a in enumerate(matches):
+        for b in matches[i + 1:]:
+            assert abs(a.x - b.x) >= 40 or abs(a.y - b.y) >= 30
+
+
+def test_find_all_keeps_separate_matches(screen, tmp_path):
+    screen[80:110, 100:140] = screen[40:70, 51:91]
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    matches = StaticRegion(screen).find_all(target, 0.99)
+    assert [(match.x, match.y) for match in matches] == [(51, 40), (100, 80)]
+
+
+def test_find_pyramid(screen, region, tmp_path, monkeypatch):
+    monkeypatch.setattr(pyvisauto.ImageMatch, 'PYRAMID_TOLERANCE', 0.15)
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    match = region.find(target, 0.99)
+    assert (match.x, match.y) == (51, 40)
+    monkeypatch.setattr(pyvisauto.ImageMatch, 'PYRAMID_TOLERANCE', None)
+    assert region.find(target, 0.99).similarity == pytest.approx(
+        match.similarity, abs=1e-4)
+
+
+def test_template_downscaled_on_first_pyramid_search(
+        screen, region, tmp_path, monkeypatch):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    region.find(target, 0.99)
+    template = pyvisauto._load_template(target, os.path.getmtime(target))
+    assert template.small is None
+    monkeypatch.setattr(pyvisauto.ImageMatch, 'PYRAMID_TOLERANCE', 0.15)
+    region.find(target, 0.99)
+    assert template.small.shape == (15, 20)
+
+
+def test_find_after_screen_changes(screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    assert region.find(target, 0.99).x == 51
+    captured = region._captured
+    region.screen = np.roll(screen, 20, axis=1)
+    match = region.find(target, 0.99)
+    assert (match.x, match.y) == (71, 40)
+    assert region._captured is captured
+    # the cached capture keeps the contents of the latest capture
+    assert region.find(target, 0.99, cached=True).x == 71
+
+
+@pytest.fixture
+def counted_region(screen, monkeypatch):
+    region = StaticRegion(screen)
+    region.captures = 0
+    capture = region._capture
+
+    def counted_capture():
+        region.captures += 1
+        return capture()
+    monkeypatch.setattr(region, '_capture', counted_capture)
+    return region
+
+
+@pytest.fixture
+def missing(tmp_path):
+    rng = np.random.default_rng(1)
+    missing = str(tmp_path / 'missing.png')
+    cv2.imwrite(missing, (rng.random((20, 20)) * 255).astype(np.uint8))
+    return missing
+
+
+def test_wait_any_returns_earliest_target(
+        screen, counted_region, missing, tmp_path):
+    early = str(tmp_path / 'early.png')
+    cv2.imwrite(early, screen[40:70, 51:91])
+    late = str(tmp_path / 'late.png')
+    cv2.imwrite(late, screen[10:30, 100:130])
+    match = counted_region.wait_any([missing, early, late], 1, 0.99)
+    assert (match.name, match.x, match.y) == (early, 51, 40)
+    assert counted_region.captures == 1
+
+
+def test_wait_any_times_out(counted_region, missing, monkeypatch):
+    delays = []
+
+    def sleep(delay):
+        delays.append(delay)
+        time.sleep(delay)
+    monkeypatch.setattr(pyvisauto, 'sleep', sleep)
+    start = time.monotonic()
+    with pytest.raises(FindFailed):
+        counted_region.wait_any([missing, missing], 0.2, 0.99)
+    assert time.monotonic() - start >= 0.2
+    # one capture per attempt, however many targets are searched for
+    assert counted_region.captures == len(delays) > 1
+
+
+def test_preload(screen, region, tmp_path):
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    Region.preload([target])
+    misses = pyvisauto._load_template.cache_info().misses
+    assert region.find(target, 0.99).x == 51
+    assert pyvisauto._load_template.cache_info().misses == misses
+
+
+def test_find_all_arrays(screen, tmp_path):
+    screen[80:110, 100:140] = screen[40:70, 51:91]
+    region = StaticRegion(screen)
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[40:70, 51:91])
+    xs, ys, sims = region.find_all_arrays(target, 0.5)
+    matches = region.find_all(target, 0.5)
+    assert [(match.x, match.y) for match in matches] == list(zip(xs, ys))
+    assert [match.similarity for match in matches] == sims.tolist()
+    assert (51, 40) in zip(xs, ys) and (100, 80) in zip(xs, ys)
+
+
+def test_captured_image(monkeypatch):
+    bgra = np.zeros((2, 3, 4), dtype=np.uint8)
+    bgra[..., :3] = (10, 20, 30)
+    region = StaticRegion(np.zeros((2, 3), dtype=np.uint8))
+    monkeypatch.setattr(region, '_capture', lambda: bgra)
+    region._update_captured()
+    assert region._captured_image().getpixel((0, 0)) == (30, 20, 10)
+    np.testing.assert_array_equal(
+        region._captured, cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY))
+
+
+def test_undecodable_template(region, tmp_path):
+    target = tmp_path / 'target.png'
+    target.write_bytes(b'not an image')
+    with pytest.raises(ValueError, match='target.png'):
+        region.find(str(target), 0.9)
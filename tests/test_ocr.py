@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+import pyvisauto
+from pyvisauto import ImageMatch, _parse_tesseract_config
+
+
+@pytest.mark.parametrize('config, expected', [
+    ('', (None, None, [])),
+    (None, (None, None, [])),
+    ('--oem 1 --psm 7', (1, 7, [])),
+    ('-c tessedit_char_whitelist=0123456789 -c load_system_dawg=',
+     (None, None, [
+         ('tessedit_char_whitelist', '0123456789'),
+         ('load_system_dawg', '')])),
+])
+def test_parse_tesseract_config(config, expected):
+    assert _parse_tesseract_config(config) == expected
+
+
+@pytest.mark.parametrize('config', [
+    # tesserocr takes the language separately, so -l is left to pytesseract
+    '-l eng',
+    '--psm',
+    '--oem 1 -c',
+    '--psm seven',
+    '-c tessedit_char_whitelist',
+])
+def test_parse_tesseract_config_unsupported(config):
+    assert _parse_tesseract_config(config) is None
+
+
+class TessBaseAPI(object):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.variables = []
+
+    def SetVariable(self, name, value):
+        self.variables.append((name, value))
+
+
+@pytest.fixture
+def tesserocr(monkeypatch):
+    monkeypatch.setattr(pyvisauto, 'PyTessBaseAPI', TessBaseAPI)
+    monkeypatch.setattr(ImageMatch, '_tesserocr', threading.local())
+
+
+def test_tesserocr_api(tesserocr):
+    api = ImageMatch._tesserocr_api('eng', '--psm 7 -c debug_file=/dev/null')
+    assert api.kwargs == {'lang': 'eng', 'psm': 7}
+    assert api.variables == [('debug_file', '/dev/null')]
+    assert ImageMatch._tesserocr_api(
+        'eng', '--psm 7 -c debug_file=/dev/null') is api
+    assert ImageMatch._tesserocr_api('eng', '-l eng') is None
+
+
+def test_tesserocr_api_per_thread(tesserocr):
+    api = ImageMatch._tesserocr_api('eng', '')
+    apis = []
+    thread = threading.Thread(
+        target=lambda: apis.append(ImageMatch._tesserocr_api('eng', '')))
+    thread.start()
+    thread.join()
+    assert apis[0] is not None and apis[0] is not api
@@ -0,0 +1,75 @@
+import weakref
+
+import cv2
+import numpy as np
+import pytest
+
+from pyvisauto import ImageMatch, Match, Region
+
+
+def test_region_without_dict():
+    region = Region(0, 0, 10, 10)
+    assert not hasattr(region, '__dict__')
+    with pytest.raises(AttributeError):
+        region.SCAN_RATE = 0.5
+
+
+def test_weakref():
+    region = Region(0, 0, 10, 10)
+    match = Match('target.png', 1, 2, 3, 4, 0.9)
+    assert weakref.ref(region)() is region
+    assert weakref.ref(match)() is match
+
+
+def test_mouse_move_speed_per_instance():
+    region = Region(0, 0, 10, 10)
+    match = Match('target.png', 1, 2, 3, 4, 0.9)
+    assert region.MOUSE_MOVE_SPEED == match.MOUSE_MOVE_SPEED == 0.2
+    region.MOUSE_MOVE_SPEED = 0.5
+    match.MOUSE_MOVE_SPEED = 0.1
+    assert (region.MOUSE_MOVE_SPEED, match.MOUSE_MOVE_SPEED) == (0.5, 0.1)
+    assert Region(0, 0, 10, 10).MOUSE_MOVE_SPEED == 0.2
+
+
+def test_class_settings_apply_to_instances(monkeypatch):
+    monkeypatch.setattr(ImageMatch, 'MOUSE_MOVE_SPEED', 0.5)
+    monkeypatch.setattr(ImageMatch, 'SCAN_RATE', 0.1)
+    region = Region(0, 0, 10, 10)
+    assert (region.MOUSE_MOVE_SPEED, region.SCAN_RATE) == (0.5, 0.1)
+    assert Match('target.png', 1, 2, 3, 4, 0.9).MOUSE_MOVE_SPEED == 0.5
+
+
+class ScreenMatch(ImageMatch):
+    """Direct ImageMatch subclass that does not initialize the capture slots.
+    """
+    __slots__ = ('screen',)
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.x = 0
+        self.y = 0
+        self.h, self.w = screen.shape
+
+    def _capture(self):
+        return cv2.cvtColor(self.screen, cv2.COLOR_GRAY2BGRA)
+
+
+def test_direct_subclass_without_clear_captured(tmp_path):
+    screen = np.zeros((40, 40), dtype=np.uint8)
+    screen[10:20, 15:30] = 255
+    screen[12:18, 17:28] = 0
+    target = str(tmp_path / 'target.png')
+    cv2.imwrite(target, screen[5:25, 10:35])
+    match = ScreenMatch(screen).find(target, 0.99, cached=True)
+    assert (match.x, match.y) == (10, 5)
+
+
+def test_scan_delays(monkeypatch):
+    region = Region(0, 0, 10, 10)
+    delays = region._scan_delays()
+    assert [next(delays) for _ in range(6)] == pytest.approx(
+        [0.005, 0.01, 0.02, 0.04, 0.05, 0.05])
+    # never waits longer than SCAN_RATE, even below MIN_SCAN_RATE
+    monkeypatch.setattr(ImageMatch, 'SCAN_RATE', 0.001)
+    delays = region._scan_delays()
+    assert [next(delays) for _ in range(2)] == [0.001, 0.001]